@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
+import argparse
 import json
+import re
 import time
 import logging
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import ijson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Dict, Any, Set
-from tqdm import tqdm
+from appdirs import user_cache_dir
 
 # Configure logging
 logging.basicConfig(
@@ -30,8 +33,15 @@ logging.getLogger("requests").setLevel(logging.WARNING)
 BASE_URL = "https://pricing.us-east-1.amazonaws.com"
 PRICING_URL = f"{BASE_URL}/offers/v1.0/aws/AmazonEC2/current/us-east-1/index.json"
 
+# Validators (ETag / Last-Modified) of the last downloaded offer file, stored with
+# the instances parsed from it so unchanged files can be skipped on the next run
+CACHE_PATH = Path(user_cache_dir("spot-optimizer", "aws-samples")) / "pricing_cache.json"
+
 # ARM instance type prefixes for faster lookup
-ARM_PREFIXES = {"t4g", "m6g", "m7g", "c6g", "c7g", "r6g", "r7g", "x2g", "im4g", "is4g"}
+ARM_PREFIXES = frozenset({"t4g", "m6g", "m7g", "c6g", "c7g", "r6g", "r7g", "x2g", "im4g", "is4g"})
+
+# Leading number of a memory string such as "8 GiB" or "1,952 GiB"
+MEMORY_PATTERN = re.compile(r'[\d.,]+')
 
 def create_session() -> requests.Session:
     """Create an optimized requests session"""
@@ -48,127 +58,156 @@ def create_session() -> requests.Session:
 
 def parse_memory(mem_str: str) -> float:
     """Parse memory string to GiB value"""
-    if not mem_str:
+    match = MEMORY_PATTERN.match(mem_str) if mem_str else None
+    if not match:
         return 0.0
-    # Extract numeric part more efficiently
-    numeric = ''.join(c for c in mem_str.split()[0] if c.isdigit() or c == '.')
     try:
-        return float(numeric) if numeric else 0.0
+        return float(match.group().replace(',', ''))
     except ValueError:
         return 0.0
 
+def load_cache() -> Dict[str, Any]:
+    """Load the cached validators and instances from the previous run"""
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) and cache.get('instances') else {}
+
+def save_cache(headers, instances: Dict[str, Dict[str, Any]]) -> None:
+    """Persist the response validators together with the parsed instances"""
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    if not (etag or last_modified):
+        return
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_PATH, 'w') as f:
+            json.dump({
+                "etag": etag,
+                "last_modified": last_modified,
+                "instances": instances
+            }, f)
+    except OSError as e:
+        logger.warning("Failed to write pricing cache: %s", e)
+
 def is_arm_instance(instance_type: str, processor: str) -> bool:
     """Fast ARM detection using prefix matching"""
-    prefix = instance_type.split('.')[0] if '.' in instance_type else instance_type
+    prefix = instance_type.partition('.')[0]
     return prefix in ARM_PREFIXES or 'graviton' in processor.lower()
 
-def fetch_instance_data(session: requests.Session) -> Dict[str, Dict[str, Any]]:
+def fetch_instance_data(session: requests.Session, use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
     """Fetch all instance data from us-east-1 pricing API"""
     logger.info("Fetching instance metadata from AWS pricing API...")
     
+    cache = load_cache() if use_cache else {}
+    headers = {}
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+    
     try:
-        response = session.get(PRICING_URL, timeout=60)
-        response.raise_for_status()
-        
-        logger.info("Parsing pricing data...")
-        data = response.json()
-        
-        instances = {}
-        products = data.get('products', {})
-        logger.info(f"Processing {len(products)} products...")
-        
-        # Process in batches for better memory usage
-        batch_size = 1000
-        processed = 0
-        
-        for product_id, product in products.items():
-            if product.get('productFamily') != 'Compute Instance':
-                continue
-                
-            attrs = product.get('attributes', {})
+        # The offer file is several hundred MB; stream it instead of
+        # materializing the whole document in memory. The context manager
+        # releases the connection however the stream is left.
+        with session.get(PRICING_URL, headers=headers, stream=True, timeout=(10, 60)) as response:
+            if response.status_code == 304:
+                logger.info("Pricing data not modified since last run, using cached instances")
+                return cache['instances']
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            logger.info("Streaming pricing data...")
             
-            # Skip if missing critical data
-            instance_type = attrs.get('instanceType')
-            vcpu_str = attrs.get('vcpu', '')
-            memory_str = attrs.get('memory', '')
+            instances = {}
             
-            if not all([instance_type, vcpu_str, memory_str]):
-                continue
+            for product_id, product in ijson.kvitems(response.raw, 'products'):
+                if product.get('productFamily') != 'Compute Instance':
+                    continue
+                    
+                attrs = product.get('attributes')
+                if not attrs:
+                    continue
+                attr = attrs.get
                 
-            # Parse vCPU count
-            try:
-                vcpu = int(vcpu_str)
-            except (ValueError, TypeError):
-                continue
+                # Skip if missing critical data
+                instance_type = attr('instanceType')
+                vcpu_str = attr('vcpu')
+                memory_str = attr('memory')
                 
-            # Parse memory
-            memory = parse_memory(memory_str)
-            if memory <= 0:
-                continue
-            
-            # Determine architecture
-            processor = attrs.get('physicalProcessor', '')
-            arch = "arm64" if is_arm_instance(instance_type, processor) else "x86_64"
-            
-            # Determine storage type
-            storage_info = attrs.get('storage', '').upper()
-            storage = "instance" if 'SSD' in storage_info else "ebs"
-            
-            instances[instance_type] = {
-                "arch": arch,
-                "vcpu": vcpu,
-                "memory": memory,
-                "storage": storage
-            }
+                if not (instance_type and vcpu_str and memory_str):
+                    continue
+                
+                # Every instance type is listed once per OS/tenancy/usage SKU with
+                # identical hardware attributes; the first valid record is enough
+                if instance_type in instances:
+                    continue
+                    
+                # Parse vCPU count (cheaper reject than memory parsing)
+                try:
+                    vcpu = int(vcpu_str)
+                except (ValueError, TypeError):
+                    continue
+                if vcpu <= 0:
+                    continue
+                    
+                # Parse memory
+                memory = parse_memory(memory_str)
+                if memory <= 0:
+                    continue
+                
+                # Determine architecture
+                processor = attr('physicalProcessor', '')
+                arch = "arm64" if is_arm_instance(instance_type, processor) else "x86_64"
+                
+                # Determine storage type
+                storage = "instance" if 'SSD' in attr('storage', '').upper() else "ebs"
+                
+                instances[instance_type] = {
+                    "arch": arch,
+                    "vcpu": vcpu,
+                    "memory": memory,
+                    "storage": storage
+                }
             
-            processed += 1
-            if processed % batch_size == 0:
-                logger.info(f"Processed {processed} instances...")
-        
-        logger.info(f"Successfully processed {len(instances)} instance types")
+        logger.info("Successfully processed %d instance types", len(instances))
+        if use_cache:
+            save_cache(response.headers, instances)
         return instances
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to fetch pricing data: {e}")
+        logger.error("Failed to fetch pricing data: %s", e)
         raise
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse pricing JSON: {e}")
+    except ijson.JSONError as e:
+        logger.error("Failed to parse pricing JSON: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         raise
 
-def validate_instances(instances: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    """Validate and clean instance data"""
-    valid_instances = {}
-    
-    for instance_type, data in instances.items():
-        # Ensure all required fields are present and valid
-        if not all([
-            data.get('arch') in ['x86_64', 'arm64'],
-            isinstance(data.get('vcpu'), int) and data['vcpu'] > 0,
-            isinstance(data.get('memory'), (int, float)) and data['memory'] > 0,
-            data.get('storage') in ['ebs', 'instance']
-        ]):
-            continue
-            
-        valid_instances[instance_type] = data
-    
-    logger.info(f"Validated {len(valid_instances)} instances")
-    return valid_instances
+def parse_args(args=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Generate instance_metadata.json from the AWS pricing API.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download the offer file, ignoring the local pricing cache.",
+    )
+    return parser.parse_args(args)
 
 def main():
     """Main execution function"""
+    args = parse_args()
     start_time = time.time()
     
     try:
         session = create_session()
         
-        # Fetch all instance data from single source
-        instances = fetch_instance_data(session)
-        
-        # Validate the data
-        valid_instances = validate_instances(instances)
+        # Fetch all instance data from single source; records are validated
+        # as they are parsed, so the result is ready to be written out
+        valid_instances = fetch_instance_data(session, use_cache=not args.no_cache)
         
         if not valid_instances:
             logger.error("No valid instances found")
@@ -178,11 +217,12 @@ def main():
         output_path = Path(__file__).parent.parent / "spot_optimizer" / "resources" / "instance_metadata.json"
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(valid_instances, f, indent=2, sort_keys=True)
+        # Serialize once and write in a single call; json.dump() with indent
+        # issues a separate write for every encoded chunk
+        output_path.write_text(json.dumps(valid_instances, indent=2, sort_keys=True))
         
         total_time = time.time() - start_time
-        logger.info(f"Successfully saved metadata for {len(valid_instances)} instances in {total_time:.2f}s")
+        logger.info("Successfully saved metadata for %d instances in %.2fs", len(valid_instances), total_time)
         
         # Print some stats
         arch_counts = {}
@@ -191,13 +231,13 @@ def main():
             arch_counts[data['arch']] = arch_counts.get(data['arch'], 0) + 1
             storage_counts[data['storage']] = storage_counts.get(data['storage'], 0) + 1
         
-        logger.info(f"Architecture breakdown: {dict(arch_counts)}")
-        logger.info(f"Storage breakdown: {dict(storage_counts)}")
+        logger.info("Architecture breakdown: %s", arch_counts)
+        logger.info("Storage breakdown: %s", storage_counts)
         
     except KeyboardInterrupt:
         logger.warning("Operation cancelled by user")
     except Exception as e:
-        logger.error(f"Failed to generate metadata: {e}")
+        logger.error("Failed to generate metadata: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,11 +1,31 @@
-from spot_optimizer.config import SpotOptimizerConfig
 from spot_optimizer.optimizer_mode import Mode
-from spot_optimizer.spot_optimizer import SpotOptimizer
-
-default_optimizer = SpotOptimizer()
 
 __all__ = ['optimize', 'Mode', 'SpotOptimizer', 'SpotOptimizerConfig']
 
+
+# SpotOptimizer pulls in duckdb, pandas and requests, so it is imported on first
+# use to keep importing the package (e.g. for `spot-optimizer --help`) cheap
+def _get_default_optimizer():
+    """Return the shared SpotOptimizer singleton, opening its database on first use."""
+    from spot_optimizer.spot_optimizer import SpotOptimizer
+    return SpotOptimizer.get_instance()
+
+
+def __getattr__(name: str):
+    """Resolve the heavy public names lazily (PEP 562)."""
+    if name == 'SpotOptimizer':
+        from spot_optimizer.spot_optimizer import SpotOptimizer
+        globals()[name] = SpotOptimizer
+        return SpotOptimizer
+    if name == 'SpotOptimizerConfig':
+        from spot_optimizer.config import SpotOptimizerConfig
+        globals()[name] = SpotOptimizerConfig
+        return SpotOptimizerConfig
+    if name == 'default_optimizer':
+        return _get_default_optimizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def optimize(
     cores: int,
     memory: int,
@@ -50,7 +70,7 @@ def optimize(
             "total_ram": 32
         }
     """
-    return default_optimizer.optimize(
+    return _get_default_optimizer().optimize(
         cores=cores,
         memory=memory,
         region=region,
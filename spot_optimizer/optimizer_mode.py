@@ -1,17 +1,24 @@
 from enum import Enum
-from typing import Dict, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 
-class Mode(Enum):
+class Mode(str, Enum):
+    """Optimization mode. Members compare and hash equal to their string values."""
+
     LATENCY = "latency"
     BALANCED = "balanced"
     FAULT_TOLERANCE = "fault_tolerance"
 
     @staticmethod
-    def calculate_ranges(total_cores: int, total_memory: int) -> Dict[str, Tuple[int, int]]:
+    @lru_cache(maxsize=256)
+    def calculate_ranges(total_cores: int, total_memory: int) -> Mapping[str, Tuple[int, int]]:
         """
         Calculate instance count ranges for different modes based on resource requirements.
         
+        Results are memoized, so they are returned as read-only mappings.
+        
         Small workloads (base_count <= 4):
             - Latency: 1 instance
             - Balanced: 2 instances
@@ -26,19 +33,15 @@ class Mode(Enum):
             total_cores: Total CPU cores required
             total_memory: Total memory required (GB)
         """
-        base_scale = max(
-            total_cores / 16,
-            total_memory / 64
-        )
-        
-        base_count = max(2, int(base_scale))
+        # Floor division gives the same result as int() of the float ratios
+        base_count = max(2, int(total_cores) // 16, int(total_memory) // 64)
 
         if base_count <= 4:
-            return {
+            return MappingProxyType({
                 Mode.LATENCY.value: (1, 1),
                 Mode.BALANCED.value: (2, 2),
                 Mode.FAULT_TOLERANCE.value: (3, 4)
-            }
+            })
         
         latency_max = max(4, base_count // 4)
         balanced_min = latency_max + 1
@@ -46,8 +49,23 @@ class Mode(Enum):
         fault_min = balanced_max + 1
         fault_max = base_count * 2
 
-        return {
+        return MappingProxyType({
             Mode.LATENCY.value: (1, latency_max),
             Mode.BALANCED.value: (balanced_min, balanced_max),
             Mode.FAULT_TOLERANCE.value: (fault_min, fault_max)
-        }
+        })
+
+    @staticmethod
+    def calculate_range(mode: str, total_cores: int, total_memory: int) -> Tuple[int, int]:
+        """
+        Calculate the instance count range for a single mode.
+        
+        Args:
+            mode: Optimization mode (a Mode member or its string value)
+            total_cores: Total CPU cores required
+            total_memory: Total memory required (GB)
+            
+        Returns:
+            Tuple of (min_instances, max_instances)
+        """
+        return Mode.calculate_ranges(total_cores, total_memory)[mode]
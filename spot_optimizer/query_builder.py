@@ -1,8 +1,77 @@
 """SQL query builder for spot instance optimization."""
 
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
 
+@lru_cache(maxsize=64)
+def _build_optimization_query(ssd_only: bool, arm_instances: bool, family_count: int) -> str:
+    """
+    Build the optimization query for one combination of filters.
+    
+    The SQL only depends on the filter flags and the number of instance family
+    placeholders, so each combination is formatted once and reused.
+    
+    Args:
+        ssd_only: Whether to filter for SSD-only instances
+        arm_instances: Whether to include ARM instances
+        family_count: Number of instance families to filter by (0 for no filter)
+        
+    Returns:
+        str: Complete SQL query with placeholders. The result row starts with
+            instance_type, instances_needed, total_cores, total_memory,
+            spot_score, interruption_rate.
+    """
+    # Build filter conditions
+    storage_filter = "AND c.storage_type = 'instance'" if ssd_only else ""
+    arch_filter = "AND c.architecture != 'arm64'" if not arm_instances else ""
+
+    family_filter = ""
+    if family_count:
+        placeholders = ','.join(['?'] * family_count)
+        family_filter = f"AND c.instance_family IN ({placeholders})"
+
+    query = f"""
+        WITH ranked_instances AS (
+            SELECT 
+                c.instance_type,
+                c.cores,
+                c.ram_gb,
+                c.spot_score,
+                c.interruption_rate,
+                GREATEST(
+                    CEIL(CAST(? AS FLOAT) / c.cores),
+                    CEIL(CAST(? AS FLOAT) / c.ram_gb)
+                ) as instances_needed
+            FROM spot_candidates c
+            WHERE 
+                c.region = ?
+                {storage_filter}
+                {arch_filter}
+                {family_filter}
+        )
+        SELECT 
+            instance_type,
+            instances_needed,
+            cores * instances_needed as total_cores,
+            ram_gb * instances_needed as total_memory,
+            spot_score,
+            interruption_rate,
+            ((cores * instances_needed) - ?) * 100.0 / ? as cpu_waste_pct,
+            ((ram_gb * instances_needed) - ?) * 100.0 / ? as memory_waste_pct
+        FROM ranked_instances
+        -- instances_needed already covers the requested cores and memory
+        WHERE instances_needed BETWEEN ? AND ?  -- Apply mode-specific instance bounds
+        ORDER BY 
+            interruption_rate ASC,
+            spot_score DESC,
+            (cpu_waste_pct + memory_waste_pct) ASC
+        LIMIT 1
+    """
+
+    return query
+
+
 class OptimizationQueryBuilder:
     """Builds SQL queries for spot instance optimization."""
     
@@ -23,55 +92,8 @@ class OptimizationQueryBuilder:
         Returns:
             str: Complete SQL query with placeholders
         """
-        # Build filter conditions
-        storage_filter = "AND i.storage_type = 'instance'" if ssd_only else ""
-        arch_filter = "AND i.architecture != 'arm64'" if not arm_instances else ""
-        
-        family_filter = ""
-        if instance_family:
-            placeholders = ','.join(['?' for _ in instance_family])
-            family_filter = f"AND i.instance_family IN ({placeholders})"
-        
-        query = f"""
-            WITH ranked_instances AS (
-                SELECT 
-                    i.instance_type,
-                    i.cores,
-                    i.ram_gb,
-                    s.s as spot_score,
-                    s.r as interruption_rate,
-                    GREATEST(
-                        CEIL(CAST(? AS FLOAT) / i.cores),
-                        CEIL(CAST(? AS FLOAT) / i.ram_gb)
-                    ) as instances_needed
-                FROM instance_types i
-                JOIN spot_advisor s ON i.instance_type = s.instance_types
-                WHERE 
-                    s.region = ?
-                    AND s.os = 'Linux'
-                    {storage_filter}
-                    {arch_filter}
-                    {family_filter}
-            )
-            SELECT 
-                *,
-                cores * instances_needed as total_cores,
-                ram_gb * instances_needed as total_memory,
-                ((cores * instances_needed) - ?) * 100.0 / ? as cpu_waste_pct,
-                ((ram_gb * instances_needed) - ?) * 100.0 / ? as memory_waste_pct
-            FROM ranked_instances
-            WHERE 
-                total_cores >= ?
-                AND total_memory >= ?
-                AND instances_needed BETWEEN ? AND ?  -- Apply mode-specific instance bounds
-            ORDER BY 
-                interruption_rate ASC,
-                spot_score DESC,
-                (cpu_waste_pct + memory_waste_pct) ASC
-            LIMIT 1
-        """
-        
-        return query
+        family_count = len(instance_family) if instance_family else 0
+        return _build_optimization_query(bool(ssd_only), bool(arm_instances), family_count)
     
     @staticmethod
     def build_query_parameters(
@@ -109,7 +131,6 @@ class OptimizationQueryBuilder:
         params.extend([
             cores, cores,           # CPU waste calculation
             memory, memory,         # Memory waste calculation
-            cores, memory,          # Minimum resource requirements
             int(min_instances), int(max_instances)  # Mode-specific instance bounds
         ])
         
@@ -142,11 +163,12 @@ class OptimizationQueryBuilder:
         Returns:
             str: Formatted error message
         """
-        params = []
-        params.append(f"cpu = {cores}")
-        params.append(f"memory = {memory}")
-        params.append(f"region = {region}")
-        params.append(f"mode = {mode}")
+        params = [
+            f"cpu = {cores}",
+            f"memory = {memory}",
+            f"region = {region}",
+            f"mode = {mode}",
+        ]
         
         if instance_family:
             params.append(f"instance_family = {instance_family}")
@@ -157,4 +179,4 @@ class OptimizationQueryBuilder:
         if not arm_instances: 
             params.append("arm_instances = False")
         
-        return "No suitable instances found matching for " + " and ".join(params)
\ No newline at end of file
+        return "No suitable instances found matching for " + " and ".join(params)
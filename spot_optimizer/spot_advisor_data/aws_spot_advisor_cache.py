@@ -1,5 +1,7 @@
 import logging
+import random
 import time
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -16,6 +18,7 @@ class AwsSpotAdvisorData:
         url: str = "https://spot-bid-advisor.s3.amazonaws.com/spot-advisor-data.json",
         request_timeout: int = 30,
         max_retries: int = 3,
+        max_backoff: float = 1.5,
     ):
         """
         Initialize the AWS Spot Advisor data fetcher.
@@ -24,15 +27,24 @@ class AwsSpotAdvisorData:
             url: The URL to fetch JSON data from.
             request_timeout: Timeout for HTTP requests in seconds.
             max_retries: Maximum number of retry attempts for failed requests.
+            max_backoff: Upper bound in seconds for the sleep between retries.
         """
         self._validate_url(url)
         self.url = url
         self.request_timeout = request_timeout
         self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        # Reused across retries and refreshes so the TLS connection is kept alive
+        self.session = requests.Session()
+
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        self.session.close()
 
     @staticmethod
+    @lru_cache(maxsize=16)
     def _validate_url(url: str) -> None:
-        """Validate the URL format."""
+        """Validate the URL format. Valid URLs are memoized; invalid ones always raise."""
         try:
             result = urlparse(url)
             if not all([result.scheme, result.netloc]):
@@ -40,6 +52,27 @@ class AwsSpotAdvisorData:
         except Exception as e:
             raise ValueError(f"Invalid URL: {str(e)}")
 
+    def _backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff capped at max_backoff, jittered down to between
+        half and all of the capped delay so it never sleeps longer than that.
+        
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            
+        Returns:
+            float: Seconds to sleep before the next attempt.
+        """
+        return min(self.max_backoff, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _is_retryable(error: RequestException) -> bool:
+        """Client errors other than 429 (Too Many Requests) will not succeed on retry."""
+        response = getattr(error, "response", None)
+        if response is None:
+            return True
+        return not (400 <= response.status_code < 500) or response.status_code == 429
+
     def fetch_data(self) -> dict:
         """
         Fetch the Spot Advisor data from AWS.
@@ -53,7 +86,7 @@ class AwsSpotAdvisorData:
         last_exception = None
         for attempt in range(self.max_retries):
             try:
-                response = requests.get(
+                response = self.session.get(
                     self.url,
                     timeout=self.request_timeout
                 )
@@ -63,12 +96,16 @@ class AwsSpotAdvisorData:
                 except ValueError as e:
                     raise RequestException(f"Failed to parse JSON response: {str(e)}") from e
             except RequestException as e:
+                if not self._is_retryable(e):
+                    message = f"Failed to fetch data: {str(e)}"
+                    logger.error(message)
+                    raise RequestException(message) from e
                 last_exception = e
                 logger.warning(
-                    f"Attempt {attempt + 1}/{self.max_retries} failed: {str(e)}"
+                    "Attempt %d/%d failed: %s", attempt + 1, self.max_retries, e
                 )
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    time.sleep(self._backoff(attempt))
                 
         message = f"Failed to fetch data after {self.max_retries} attempts"
         logger.error(message, exc_info=last_exception)
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta
+from typing import Optional
 
 from spot_optimizer.spot_advisor_data.aws_spot_advisor_cache import AwsSpotAdvisorData
 from spot_optimizer.storage_engine.storage_engine import StorageEngine
@@ -7,6 +8,28 @@ from spot_optimizer.storage_engine.storage_engine import StorageEngine
 logger = logging.getLogger(__name__)
 
 CACHE_EXPIRY_SECONDS = 3600  # 1 hour
+STALE_DATA_MAX_AGE_SECONDS = 86400  # 24 hours
+FRESHNESS_CHECK_INTERVAL_SECONDS = 60  # How long callers may skip re-checking
+
+LAST_UPDATE_QUERY = "SELECT MAX(timestamp) FROM cache_timestamp"
+
+def _get_data_age(db: StorageEngine) -> Optional[float]:
+    """
+    Get the age of the stored spot advisor data.
+    
+    Args:
+        db: Database connection
+        
+    Returns:
+        Optional[float]: Seconds since the last update, or None if no data is stored
+    """
+    row = db.query_one(LAST_UPDATE_QUERY)
+    # MAX() over an empty table yields a single NULL row
+    if row is None or row[0] is None:
+        return None
+        
+    last_update = row[0]
+    return (datetime.now() - last_update).total_seconds()
 
 def should_refresh_data(db: StorageEngine) -> bool:
     """
@@ -19,22 +42,33 @@ def should_refresh_data(db: StorageEngine) -> bool:
         bool: True if data should be refreshed
     """
     try:
-        result = db.query_data(
-            "SELECT timestamp FROM cache_timestamp ORDER BY timestamp DESC LIMIT 1"
-        )
-        if result.empty:
+        time_since_update = _get_data_age(db)
+        if time_since_update is None:
             return True
-            
-        last_update = result.iloc[0]['timestamp']
-        time_since_update = (datetime.now() - last_update).total_seconds()
 
-        logger.info(f"Time since last update: {time_since_update} seconds")
+        logger.debug("Time since last update: %.0f seconds", time_since_update)
         
         return time_since_update > CACHE_EXPIRY_SECONDS
     except Exception as e:
-        logger.warning(f"Error checking cache timestamp: {e}")
+        logger.warning("Error checking cache timestamp: %s", e)
         return True
 
+def _has_cached_data(db: StorageEngine) -> bool:
+    """
+    Check if the database holds data recent enough to serve when a refresh fails.
+    
+    Args:
+        db: Database connection
+        
+    Returns:
+        bool: True if stored data is younger than STALE_DATA_MAX_AGE_SECONDS
+    """
+    try:
+        time_since_update = _get_data_age(db)
+    except Exception:
+        return False
+    return time_since_update is not None and time_since_update <= STALE_DATA_MAX_AGE_SECONDS
+
 def refresh_spot_data(
     advisor: AwsSpotAdvisorData,
     db: StorageEngine
@@ -49,11 +83,8 @@ def refresh_spot_data(
     logger.info("Fetching fresh spot advisor data...")
     data = advisor.fetch_data()
     
-    # Clear existing data
-    db.clear_data()
-    
-    # Store new data
-    db.store_data(data)
+    # Replace existing data; on failure the previous data is kept
+    db.replace_data(data)
     logger.info("Spot advisor data updated successfully")
 
 def ensure_fresh_data(
@@ -63,15 +94,19 @@ def ensure_fresh_data(
     """
     Ensure the database has fresh spot advisor data.
     
+    If the refresh fails but the stored data is younger than
+    STALE_DATA_MAX_AGE_SECONDS, the stale data is kept and served.
+    
     Args:
         advisor: Spot advisor data fetcher
         db: Database connection
     """
-    try:
-        if should_refresh_data(db):
+    if should_refresh_data(db):
+        try:
             refresh_spot_data(advisor, db)
-        else:
-            logger.info("Using existing spot advisor data from database")
-    except Exception as e:
-        logger.error(f"Error ensuring fresh data: {e}")
-        raise
\ No newline at end of file
+        except Exception as e:
+            if not _has_cached_data(db):
+                raise
+            logger.warning("Failed to refresh spot advisor data, using cached data: %s", e)
+    else:
+        logger.debug("Using existing spot advisor data from database")
\ No newline at end of file
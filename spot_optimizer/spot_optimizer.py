@@ -1,4 +1,8 @@
+import copy
 import logging
+import threading
+from collections import OrderedDict
+from time import monotonic
 from typing import Dict, List, Optional
 
 from spot_optimizer.config import SpotOptimizerConfig
@@ -6,12 +10,17 @@ from spot_optimizer.optimizer_mode import Mode
 from spot_optimizer.query_builder import OptimizationQueryBuilder
 from spot_optimizer.spot_advisor_data.aws_spot_advisor_cache import AwsSpotAdvisorData
 from spot_optimizer.storage_engine.duckdb_storage_engine import DuckDBStorage
-from spot_optimizer.spot_advisor_engine import ensure_fresh_data
+from spot_optimizer.spot_advisor_engine import (
+    ensure_fresh_data,
+    FRESHNESS_CHECK_INTERVAL_SECONDS
+)
 from spot_optimizer.validators import validate_optimization_params
 
 
 logger = logging.getLogger(__name__)
 
+RESULT_CACHE_SIZE = 1024  # Number of optimize() results kept per optimizer
+
 class SpotOptimizer:
     """Manages spot instance optimization with cached data access."""
     
@@ -25,7 +34,7 @@ class SpotOptimizer:
             config: Configuration instance. If None, uses default configuration.
         """
         self.config = config or SpotOptimizerConfig.from_env()
-        logger.debug(f"Using database path: {self.config.db_path}")
+        logger.debug("Using database path: %s", self.config.db_path)
         
         self.spot_advisor = AwsSpotAdvisorData(
             url=self.config.spot_advisor_url,
@@ -35,9 +44,16 @@ class SpotOptimizer:
         self.db = DuckDBStorage(db_path=self.config.db_path)
         self.db.connect()
         self.query_builder = OptimizationQueryBuilder()
+        # Monotonic deadline until which the data is known to be fresh
+        self._fresh_until = 0.0
+        # Results of recent optimize() calls, valid until the next freshness check
+        self._result_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         
     def __del__(self):
-        """Cleanup database connection."""
+        """Cleanup database connection and HTTP session."""
+        if hasattr(self, 'spot_advisor'):
+            self.spot_advisor.close()
         if hasattr(self, 'db'):
             self.db.disconnect()
     
@@ -56,6 +72,37 @@ class SpotOptimizer:
             cls._instance = cls(config)
         return cls._instance
     
+    def _ensure_fresh_data(self) -> None:
+        """
+        Ensure the data is fresh, checking the database at most once per
+        FRESHNESS_CHECK_INTERVAL_SECONDS.
+        """
+        now = monotonic()
+        if now < self._fresh_until:
+            return
+        ensure_fresh_data(self.spot_advisor, self.db)
+        # The data may have been refreshed, by this or another process
+        with self._result_cache_lock:
+            self._result_cache.clear()
+        self._fresh_until = now + FRESHNESS_CHECK_INTERVAL_SECONDS
+    
+    def _get_cached_result(self, key: tuple) -> Optional[Dict]:
+        """Return a copy of a cached optimize() result, or None on a miss."""
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _cache_result(self, key: tuple, result: Dict) -> None:
+        """Store an optimize() result, evicting the least recently used entry when full."""
+        with self._result_cache_lock:
+            self._result_cache[key] = copy.deepcopy(result)
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
     def optimize(
         self,
         cores: int,
@@ -71,13 +118,23 @@ class SpotOptimizer:
         Optimize spot instance configuration based on requirements.
         """
         validate_optimization_params(cores, memory, mode)
+        # Accept Mode members too, but work with the plain string from here on
+        mode = Mode(mode).value
         
         try:
-            ensure_fresh_data(self.spot_advisor, self.db)
+            self._ensure_fresh_data()
+            
+            cache_key = (
+                cores, memory, region, ssd_only, arm_instances,
+                tuple(instance_family) if instance_family else None,
+                emr_version, mode
+            )
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                return cached
             
             # Get instance count range based on mode
-            mode_ranges = Mode.calculate_ranges(cores, memory)
-            min_instances, max_instances = mode_ranges[mode]
+            min_instances, max_instances = Mode.calculate_range(mode, cores, memory)
             
             # Build query and parameters using the query builder
             query = self.query_builder.build_optimization_query(
@@ -95,9 +152,9 @@ class SpotOptimizer:
                 max_instances=max_instances
             )
             
-            result = self.db.query_data(query, params)
+            best_match = self.db.query_one(query, params)
             
-            if len(result) == 0:
+            if best_match is None:
                 error_msg = self.query_builder.build_error_message_params(
                     cores=cores,
                     memory=memory,
@@ -110,22 +167,28 @@ class SpotOptimizer:
                 )
                 raise ValueError(error_msg)
             
-            best_match = result.iloc[0]
+            # Column order is fixed by the optimization query
+            (
+                instance_type, instances_needed, total_cores, total_memory,
+                spot_score, interruption_rate
+            ) = best_match[:6]
             
-            return {
+            optimized = {
                 "instances": {
-                    "type": best_match['instance_type'],
-                    "count": int(best_match['instances_needed'])
+                    "type": instance_type,
+                    "count": int(instances_needed)
                 },
                 "mode": mode,
-                "total_cores": int(best_match['total_cores']),
-                "total_ram": int(best_match['total_memory']),
+                "total_cores": int(total_cores),
+                "total_ram": int(total_memory),
                 "reliability": {
-                    "spot_score": int(best_match['spot_score']),
-                    "interruption_rate": int(best_match['interruption_rate'])
+                    "spot_score": int(spot_score),
+                    "interruption_rate": int(interruption_rate)
                 }
             }
+            self._cache_result(cache_key, optimized)
+            return optimized
             
         except Exception as e:
-            logger.error(f"Error optimizing instances: {e}")
+            logger.error("Error optimizing instances: %s", e)
             raise
@@ -1,8 +1,9 @@
 import os
 import json
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import duckdb
 import pandas as pd
@@ -13,6 +14,69 @@ from spot_optimizer.storage_engine.storage_engine import StorageEngine
 class DuckDBStorage(StorageEngine):
     """DuckDB implementation of the storage engine."""
 
+    DATA_TABLES = (
+        "cache_timestamp", "global_rate", "instance_types", "ranges", "spot_advisor", "spot_candidates"
+    )
+
+    SCHEMA_DDL = """
+        CREATE TABLE IF NOT EXISTS cache_timestamp (timestamp TIMESTAMP);
+        CREATE TABLE IF NOT EXISTS global_rate (global_rate VARCHAR);
+        CREATE TABLE IF NOT EXISTS instance_types (
+            instance_type VARCHAR,
+            instance_family VARCHAR,
+            cores INTEGER,
+            ram_gb FLOAT,
+            storage_type VARCHAR,
+            architecture VARCHAR,
+            emr_compatible BOOLEAN DEFAULT FALSE,
+            emr_min_version VARCHAR
+        );
+        CREATE TABLE IF NOT EXISTS ranges (
+            index INTEGER,
+            label VARCHAR,
+            dots INTEGER,
+            max INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS spot_advisor (
+            region VARCHAR,
+            os VARCHAR,
+            instance_types VARCHAR,
+            s INTEGER,
+            r INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS spot_candidates (
+            instance_type VARCHAR,
+            instance_family VARCHAR,
+            cores INTEGER,
+            ram_gb FLOAT,
+            storage_type VARCHAR,
+            architecture VARCHAR,
+            region VARCHAR,
+            spot_score INTEGER,
+            interruption_rate INTEGER
+        );
+    """
+
+    # Linux instance types joined with their spot scores, materialized once per
+    # refresh so optimization queries scan a single table instead of joining
+    BUILD_CANDIDATES_SQL = """
+        DELETE FROM spot_candidates;
+        INSERT INTO spot_candidates
+        SELECT
+            i.instance_type,
+            i.instance_family,
+            i.cores,
+            i.ram_gb,
+            i.storage_type,
+            i.architecture,
+            s.region,
+            s.s,
+            s.r
+        FROM instance_types i
+        JOIN spot_advisor s ON i.instance_type = s.instance_types
+        WHERE s.os = 'Linux';
+    """
+
     def __init__(self, db_path: str = ":memory:"):
         """
         Initialize DuckDB storage.
@@ -42,125 +106,129 @@ class DuckDBStorage(StorageEngine):
         if not self.conn:
             raise RuntimeError("No database connection")
 
-        tables = {
-            "cache_timestamp": "CREATE TABLE IF NOT EXISTS cache_timestamp (timestamp TIMESTAMP)",
-            "global_rate": "CREATE TABLE IF NOT EXISTS global_rate (global_rate VARCHAR)",
-            "instance_types": """
-                CREATE TABLE IF NOT EXISTS instance_types (
-                    instance_type VARCHAR,
-                    instance_family VARCHAR,
-                    cores INTEGER,
-                    ram_gb FLOAT,
-                    storage_type VARCHAR,
-                    architecture VARCHAR,
-                    emr_compatible BOOLEAN DEFAULT FALSE,
-                    emr_min_version VARCHAR
-                )
-            """,
-            "ranges": """
-                CREATE TABLE IF NOT EXISTS ranges (
-                    index INTEGER,
-                    label VARCHAR,
-                    dots INTEGER,
-                    max INTEGER
-                )
-            """,
-            "spot_advisor": """
-                CREATE TABLE IF NOT EXISTS spot_advisor (
-                    region VARCHAR,
-                    os VARCHAR,
-                    instance_types VARCHAR,
-                    s INTEGER,
-                    r INTEGER
-                )
-            """
-        }
-
-        for table_name, create_sql in tables.items():
-            try:
-                self.conn.execute(create_sql)
-            except Exception as e:
-                raise RuntimeError(f"Failed to create table {table_name}: {str(e)}")
+        # Executed as one script: parsed and run in a single call
+        try:
+            self.conn.execute(self.SCHEMA_DDL)
+            # Databases written before spot_candidates existed have data but no
+            # candidates; build them now rather than waiting for the next refresh
+            if self.conn.execute("SELECT COUNT(*) FROM spot_candidates").fetchone()[0] == 0:
+                self.conn.execute(self.BUILD_CANDIDATES_SQL)
+        except Exception as e:
+            raise RuntimeError(f"Failed to create tables: {str(e)}")
 
     def store_data(self, data: Dict[str, Any]) -> None:
         """
-        Store data in DuckDB.
+        Store data in DuckDB in a single transaction.
         :param data: Dictionary containing data to be stored.
-        :raises RuntimeError: If no database connection exists.
+        :raises RuntimeError: If no database connection exists or storing fails.
         """
         if not self.conn:
             raise RuntimeError("No database connection")
 
-        try:
-            # Store timestamp
-            self.conn.execute(
-                "INSERT INTO cache_timestamp (timestamp) VALUES (?)",
-                [datetime.now()]
-            )
+        self._run_in_transaction(lambda: self._write_data(data), "Failed to store data")
 
-            # Store global rate
-            self.conn.execute(
-                "INSERT INTO global_rate (global_rate) VALUES (?)",
-                [data["global_rate"]]
-            )
-            
-            # Store instance data with metadata
-            instance_data = []
-            for key, value in data["instance_types"].items():
-                # Get storage and arch from metadata, fallback to defaults if not found
-                metadata = self.instance_metadata.get(key, {})
-                instance_data.append((
-                    key,
-                    key.split(".")[0],
-                    value["cores"],
-                    value["ram_gb"],
-                    metadata.get("storage", "ebs"),
-                    metadata.get("arch", "x86_64"),
-                    value.get("emr", False),
-                    value.get("emr_min_version", None)
-                ))
-
-            self.conn.executemany(
-                """
-                INSERT INTO instance_types (
-                    instance_type, instance_family, cores, ram_gb,
-                    storage_type, architecture,
-                    emr_compatible, emr_min_version
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                instance_data
+    def replace_data(self, data: Dict[str, Any]) -> None:
+        """
+        Replace all stored data in a single transaction, so a failed write
+        leaves the previous data in place.
+        :param data: Dictionary containing data to be stored.
+        :raises RuntimeError: If no database connection exists or replacing fails.
+        """
+        if not self.conn:
+            raise RuntimeError("No database connection")
+
+        def replace() -> None:
+            self._delete_all()
+            self._write_data(data)
+
+        self._run_in_transaction(replace, "Failed to replace data")
+
+    def _write_data(self, data: Dict[str, Any]) -> None:
+        """
+        Insert data into the tables, without managing a transaction.
+        :param data: Dictionary containing data to be stored.
+        """
+        # Store global rate
+        self.conn.execute(
+            "INSERT INTO global_rate (global_rate) VALUES (?)",
+            [data["global_rate"]]
+        )
+        
+        # Store instance data with metadata
+        get_specs = itemgetter("cores", "ram_gb")
+        instance_data = []
+        for key, value in data["instance_types"].items():
+            # Get storage and arch from metadata, fallback to defaults if not found
+            metadata = self.instance_metadata.get(key, {})
+            instance_data.append((
+                key,
+                key.partition(".")[0],
+                *get_specs(value),
+                metadata.get("storage", "ebs"),
+                metadata.get("arch", "x86_64"),
+                value.get("emr", False),
+                value.get("emr_min_version", None)
+            ))
+
+        self._insert_dataframe(
+            "instance_types",
+            pd.DataFrame.from_records(
+                instance_data,
+                columns=[
+                    "instance_type", "instance_family", "cores", "ram_gb",
+                    "storage_type", "architecture",
+                    "emr_compatible", "emr_min_version"
+                ]
             )
+        )
 
-            # Store ranges data
-            ranges_data = [
-                (item["index"], item["label"], item["dots"], item["max"])
-                for item in data["ranges"]
-            ]
-            self.conn.executemany(
-                "INSERT INTO ranges (index, label, dots, max) VALUES (?, ?, ?, ?)",
-                ranges_data
+        # Store ranges data
+        ranges_data = list(map(itemgetter("index", "label", "dots", "max"), data["ranges"]))
+        self._insert_dataframe(
+            "ranges",
+            pd.DataFrame.from_records(
+                ranges_data,
+                columns=["index", "label", "dots", "max"]
             )
+        )
 
-            # Fix: Store spot advisor data with correct structure
-            spot_advisor_data = []
-            for region, os_data in data["spot_advisor"].items():
-                for os_name, instance_data in os_data.items():
-                    for instance_type, scores in instance_data.items():
-                        spot_advisor_data.append((
-                            region,          # e.g., "ap-southeast-4"
-                            os_name,         # e.g., "Linux"
-                            instance_type,   # e.g., "r6i.24xlarge"
-                            scores["s"],     # spot score
-                            scores["r"]      # rate
-                        ))
-
-            self.conn.executemany(
-                "INSERT INTO spot_advisor (region, os, instance_types, s, r) VALUES (?, ?, ?, ?, ?)",
-                spot_advisor_data
+        # Store spot advisor data: region -> os -> instance type -> scores
+        get_scores = itemgetter("s", "r")  # spot score, rate
+        spot_advisor_data = [
+            (
+                region,          # e.g., "ap-southeast-4"
+                os_name,         # e.g., "Linux"
+                instance_type,   # e.g., "r6i.24xlarge"
+                *get_scores(scores)
+            )
+            for region, os_data in data["spot_advisor"].items()
+            for os_name, instance_data in os_data.items()
+            for instance_type, scores in instance_data.items()
+        ]
+        self._insert_dataframe(
+            "spot_advisor",
+            pd.DataFrame.from_records(
+                spot_advisor_data,
+                columns=["region", "os", "instance_types", "s", "r"]
             )
+        )
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to store data: {str(e)}")
+        self.conn.execute(self.BUILD_CANDIDATES_SQL)
+
+        # Store timestamp last: it marks the data as complete and fresh
+        self.conn.execute(
+            "INSERT INTO cache_timestamp (timestamp) VALUES (?)",
+            [datetime.now()]
+        )
+
+    def _insert_dataframe(self, table: str, df: pd.DataFrame) -> None:
+        """
+        Bulk insert a DataFrame through DuckDB's appender instead of
+        row-by-row executemany.
+        :param table: Target table name.
+        :param df: DataFrame whose column names match the target columns.
+        """
+        self.conn.append(table, df, by_name=True)
 
     def query_data(self, query: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
         """
@@ -180,6 +248,24 @@ class DuckDBStorage(StorageEngine):
         except Exception as e:
             raise RuntimeError(f"Query failed: {str(e)}")
 
+    def query_one(self, query: str, params: Optional[List[Any]] = None) -> Optional[tuple]:
+        """
+        Query a single row from DuckDB without materializing a DataFrame.
+        :param query: SQL query string.
+        :param params: Optional query parameters.
+        :return: First row of the result as a tuple, or None if there are no rows.
+        :raises RuntimeError: If no database connection exists.
+        """
+        if not self.conn:
+            raise RuntimeError("No database connection")
+
+        try:
+            if params:
+                return self.conn.execute(query, params).fetchone()
+            return self.conn.execute(query).fetchone()
+        except Exception as e:
+            raise RuntimeError(f"Query failed: {str(e)}")
+
     def clear_data(self) -> None:
         """
         Clear all data from DuckDB tables.
@@ -188,9 +274,36 @@ class DuckDBStorage(StorageEngine):
         if not self.conn:
             raise RuntimeError("No database connection")
 
-        tables = ["cache_timestamp", "global_rate", "instance_types", "ranges", "spot_advisor"]
-        for table in tables:
+        # One transaction for all tables: a single commit, and a failure
+        # part-way through leaves every table untouched
+        self._run_in_transaction(self._delete_all, "Failed to clear data")
+
+    def _delete_all(self) -> None:
+        """
+        Delete every row from the data tables, without managing a transaction.
+        :raises RuntimeError: If a table cannot be cleared.
+        """
+        for table in self.DATA_TABLES:
             try:
                 self.conn.execute(f"DELETE FROM {table}")
             except Exception as e:
                 raise RuntimeError(f"Failed to clear table {table}: {str(e)}")
+
+    def _run_in_transaction(self, action: Callable[[], None], error_message: str) -> None:
+        """
+        Run an action in a single transaction, rolling back if any step fails.
+        :param action: Callable performing the writes.
+        :param error_message: Prefix of the RuntimeError raised on failure.
+        :raises RuntimeError: If beginning, running or committing the transaction fails.
+        """
+        try:
+            self.conn.begin()
+            action()
+            self.conn.commit()
+        except Exception as e:
+            try:
+                self.conn.rollback()
+            except duckdb.Error:
+                # Nothing to roll back: the transaction never started or already ended
+                pass
+            raise RuntimeError(f"{error_message}: {str(e)}")
@@ -35,11 +35,34 @@ class StorageEngine(ABC):
         """
         pass
 
+    def query_one(self, query: str, params: Optional[List[Any]] = None) -> Optional[tuple]:
+        """
+        Query a single row from the storage engine.
+        Engines that can fetch a row without building a DataFrame should override this.
+        :param query: Query string appropriate for the storage engine.
+        :param params: Optional parameters for the query.
+        :return: First row of the result as a tuple, or None if there are no rows.
+        """
+        result = self.query_data(query, params)
+        if result.empty:
+            return None
+        return tuple(result.iloc[0])
+
     @abstractmethod
     def clear_data(self) -> None:
         """Clear all data from the storage."""
         pass
 
+    def replace_data(self, data: Dict[str, Any]) -> None:
+        """
+        Replace all stored data with new data.
+        Engines that support transactions should override this so a failed
+        store leaves the previous data in place.
+        :param data: Dictionary containing data to be stored.
+        """
+        self.clear_data()
+        self.store_data(data)
+
     def __enter__(self):
         """Context manager entry."""
         self.connect()
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from spot_optimizer.optimizer_mode import Mode
 
+INVALID_MODE_MESSAGE = f"Invalid mode. Must be one of: {', '.join(m.value for m in Mode)}"
+
 def validate_cores(cores: int) -> None:
     """Validate CPU cores requirement."""
     if cores <= 0:
@@ -16,8 +18,7 @@ def validate_mode(mode: str) -> None:
     try:
         Mode(mode)
     except ValueError:
-        valid_modes = [m.value for m in Mode]
-        raise ValueError(f"Invalid mode. Must be one of: {', '.join(valid_modes)}")
+        raise ValueError(INVALID_MODE_MESSAGE)
 
 def validate_optimization_params(
     cores: int,
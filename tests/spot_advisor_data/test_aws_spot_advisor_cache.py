@@ -32,6 +32,7 @@ def test_init_with_valid_url():
     assert advisor.url == "https://example.com/data.json"
     assert advisor.request_timeout == 20
     assert advisor.max_retries == 2
+    assert isinstance(advisor.session, requests.Session)
 
 
 @pytest.mark.parametrize("invalid_url", [
@@ -46,7 +47,7 @@ def test_init_with_invalid_url(invalid_url):
         AwsSpotAdvisorData(url=invalid_url)
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_fetch_data_success(mock_get, sample_spot_data):
     """Test successful data fetch."""
     mock_response = Mock()
@@ -64,7 +65,7 @@ def test_fetch_data_success(mock_get, sample_spot_data):
     )
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_fetch_data_retry_success(mock_get, sample_spot_data):
     """Test successful fetch after retries."""
     # First call fails, second succeeds
@@ -84,7 +85,33 @@ def test_fetch_data_retry_success(mock_get, sample_spot_data):
     assert mock_get.call_count == 2
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
+def test_fetch_data_reuses_session(mock_get, sample_spot_data):
+    """Test that repeated fetches go through the same session."""
+    mock_response = Mock()
+    mock_response.json.return_value = sample_spot_data
+    mock_response.raise_for_status.return_value = None
+    mock_get.return_value = mock_response
+
+    advisor = AwsSpotAdvisorData()
+    session = advisor.session
+    advisor.fetch_data()
+    advisor.fetch_data()
+
+    assert advisor.session is session
+    assert mock_get.call_count == 2
+
+
+@patch('requests.Session.close')
+def test_close_closes_session(mock_close):
+    """Test that close() releases the HTTP session."""
+    advisor = AwsSpotAdvisorData()
+    advisor.close()
+
+    mock_close.assert_called_once()
+
+
+@patch('requests.Session.get')
 def test_fetch_data_all_retries_fail(mock_get):
     """Test when all retry attempts fail."""
     mock_response = Mock()
@@ -100,7 +127,7 @@ def test_fetch_data_all_retries_fail(mock_get):
     assert mock_get.call_count == 2
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_fetch_data_invalid_json(mock_get):
     """Test handling of invalid JSON response."""
     mock_response = Mock()
@@ -114,7 +141,7 @@ def test_fetch_data_invalid_json(mock_get):
         advisor.fetch_data()
 
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_fetch_data_timeout(mock_get):
     """Test handling of request timeout."""
     mock_get.side_effect = requests.Timeout("Request timed out")
@@ -127,20 +154,99 @@ def test_fetch_data_timeout(mock_get):
     assert mock_get.call_count == advisor.max_retries
 
 
+@patch('random.uniform', side_effect=lambda low, high: high)
 @patch('time.sleep')
-@patch('requests.get')
-def test_exponential_backoff(mock_get, mock_sleep):
+@patch('requests.Session.get')
+def test_exponential_backoff(mock_get, mock_sleep, mock_uniform):
     """Test exponential backoff between retries."""
     mock_response = Mock()
     mock_response.raise_for_status.side_effect = requests.RequestException("Failed")
     mock_get.return_value = mock_response
 
-    advisor = AwsSpotAdvisorData(max_retries=3)
+    advisor = AwsSpotAdvisorData(max_retries=4, max_backoff=10.0)
     
     with pytest.raises(requests.RequestException):
         advisor.fetch_data()
     
-    # Should have tried to sleep twice (not on last attempt)
-    assert mock_sleep.call_count == 2
-    mock_sleep.assert_any_call(1)  # 2^0
-    mock_sleep.assert_any_call(2)  # 2^1
+    # Should sleep between attempts (not after the last one); jitter only
+    # shortens the delay, so its upper bound is exactly 2^attempt
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == [1, 2, 4]
+    mock_uniform.assert_called_with(0.5, 1.0)
+
+
+@patch('random.uniform', side_effect=lambda low, high: high)
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_backoff_is_capped(mock_get, mock_sleep, mock_uniform):
+    """Test that the default cap shortens the worst-case retry wait."""
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.RequestException("Failed")
+    mock_get.return_value = mock_response
+
+    advisor = AwsSpotAdvisorData()
+    
+    with pytest.raises(requests.RequestException):
+        advisor.fetch_data()
+    
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == [1, 1.5]
+
+
+@patch('random.uniform', side_effect=lambda low, high: low)
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_backoff_jitter_lower_bound(mock_get, mock_sleep, mock_uniform):
+    """Test that jitter sleeps at least half of the capped delay."""
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.RequestException("Failed")
+    mock_get.return_value = mock_response
+
+    advisor = AwsSpotAdvisorData()
+    
+    with pytest.raises(requests.RequestException):
+        advisor.fetch_data()
+    
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == [0.5, 0.75]
+
+
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_client_error_not_retried(mock_get, mock_sleep):
+    """Test that 4xx responses fail immediately."""
+    error_response = Mock(status_code=404)
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.HTTPError(
+        "404 Not Found", response=error_response
+    )
+    mock_get.return_value = mock_response
+
+    advisor = AwsSpotAdvisorData(max_retries=3)
+    
+    with pytest.raises(requests.RequestException) as exc_info:
+        advisor.fetch_data()
+    
+    assert "404 Not Found" in str(exc_info.value)
+    assert mock_get.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch('time.sleep')
+@patch('requests.Session.get')
+def test_too_many_requests_is_retried(mock_get, mock_sleep, sample_spot_data):
+    """Test that 429 responses are retried."""
+    throttled = Mock()
+    throttled.raise_for_status.side_effect = requests.HTTPError(
+        "429 Too Many Requests", response=Mock(status_code=429)
+    )
+    success = Mock()
+    success.json.return_value = sample_spot_data
+    success.raise_for_status.return_value = None
+    mock_get.side_effect = [throttled, success]
+
+    advisor = AwsSpotAdvisorData(max_retries=3)
+    
+    assert advisor.fetch_data() == sample_spot_data
+    assert mock_get.call_count == 2
+    assert mock_sleep.call_count == 1
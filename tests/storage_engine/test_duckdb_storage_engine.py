@@ -1,4 +1,7 @@
+import duckdb
 import pytest
+from unittest.mock import Mock
+
 from spot_optimizer.storage_engine.duckdb_storage_engine import DuckDBStorage
 
 
@@ -92,18 +95,176 @@ def test_store_and_query_data(db, sample_data):
     assert result['label'].tolist() == ['low', 'medium']
 
 
+def test_store_instance_types_columns(db, sample_data):
+    """Test that bulk-inserted instance types keep every column value."""
+    sample_data["instance_types"]["x9.unknown"] = {"cores": 2, "ram_gb": 0.5}
+    db.store_data(sample_data)
+
+    result = db.query_data(
+        "SELECT * FROM instance_types ORDER BY instance_type"
+    ).set_index("instance_type")
+
+    assert result.loc["c6g.2xlarge", "instance_family"] == "c6g"
+    assert result.loc["c6g.2xlarge", "cores"] == 8
+    assert result.loc["c6g.2xlarge", "architecture"] == "arm64"
+    assert result.loc["m5.xlarge", "emr_compatible"]
+    assert result.loc["m5.xlarge", "emr_min_version"] == "5.0.0"
+
+    # Types missing from the metadata fall back to defaults
+    assert result.loc["x9.unknown", "ram_gb"] == 0.5
+    assert result.loc["x9.unknown", "storage_type"] == "ebs"
+    assert result.loc["x9.unknown", "architecture"] == "x86_64"
+    assert not result.loc["x9.unknown", "emr_compatible"]
+    assert result["emr_min_version"].isna().sum() == 1
+
+
+def test_store_builds_spot_candidates(db, sample_data):
+    """Test that storing data materializes Linux candidates with their scores."""
+    db.store_data(sample_data)
+
+    result = db.query_data(
+        "SELECT region, instance_type, architecture, spot_score, interruption_rate "
+        "FROM spot_candidates ORDER BY region, instance_type"
+    )
+    assert result.values.tolist() == [
+        ["us-east-1", "m5.xlarge", "x86_64", 80, 1],
+        ["us-west-2", "c6g.2xlarge", "arm64", 65, 2],
+        ["us-west-2", "m5.xlarge", "x86_64", 75, 1],
+    ]
+
+
+def test_spot_candidates_built_for_existing_database(tmp_path, sample_data):
+    """Test that a database written before spot_candidates existed gets it on connect."""
+    db_path = str(tmp_path / "existing.db")
+    with DuckDBStorage(db_path) as db:
+        db.store_data(sample_data)
+        db.conn.execute("DROP TABLE spot_candidates")
+
+    with DuckDBStorage(db_path) as db:
+        result = db.query_data("SELECT COUNT(*) as count FROM spot_candidates")
+        assert result['count'].iloc[0] == 3
+
+
+def test_empty_spot_candidates_rebuilt_on_connect(tmp_path, sample_data):
+    """Test that a database with data but no candidate rows is rebuilt on connect."""
+    db_path = str(tmp_path / "existing.db")
+    with DuckDBStorage(db_path) as db:
+        db.store_data(sample_data)
+        db.conn.execute("DELETE FROM spot_candidates")
+
+    with DuckDBStorage(db_path) as db:
+        assert db.query_one("SELECT COUNT(*) FROM spot_candidates") == (3,)
+        assert db.query_one(
+            "SELECT spot_score FROM spot_candidates WHERE region = ? AND instance_type = ?",
+            params=["us-east-1", "m5.xlarge"]
+        ) == (80,)
+
+
+def test_create_tables_failure(tmp_path, sample_data):
+    """Test that a schema or candidate build failure surfaces as RuntimeError."""
+    db_path = str(tmp_path / "broken.db")
+    with DuckDBStorage(db_path) as db:
+        db.store_data(sample_data)
+        db.conn.execute("DROP TABLE spot_candidates")
+        db.conn.execute("CREATE TABLE spot_candidates (instance_type VARCHAR)")
+
+    db = DuckDBStorage(db_path)
+    with pytest.raises(RuntimeError) as exc_info:
+        db.connect()
+    assert "Failed to create tables" in str(exc_info.value)
+    db.disconnect()
+
+
+def test_create_tables_without_connection():
+    """Test that creating tables requires a connection."""
+    with pytest.raises(RuntimeError) as exc_info:
+        DuckDBStorage(":memory:")._create_tables()
+    assert "No database connection" in str(exc_info.value)
+
+
 def test_clear_data(db, sample_data):
     """Test clearing data from tables."""
     db.store_data(sample_data)
     db.clear_data()
 
     # Verify all tables are empty
-    tables = ["cache_timestamp", "global_rate", "instance_types", "ranges", "spot_advisor"]
+    tables = ["cache_timestamp", "global_rate", "instance_types", "ranges", "spot_advisor", "spot_candidates"]
     for table in tables:
         result = db.query_data(f"SELECT COUNT(*) as count FROM {table}")
         assert result['count'].iloc[0] == 0
 
 
+def test_clear_data_failure_rolls_back(db, sample_data):
+    """Test that a failed clear leaves every table untouched."""
+    db.store_data(sample_data)
+    db.conn.execute("DROP TABLE spot_advisor")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.clear_data()
+    assert "Failed to clear table spot_advisor" in str(exc_info.value)
+
+    for table in ["cache_timestamp", "global_rate", "instance_types", "ranges"]:
+        result = db.query_data(f"SELECT COUNT(*) as count FROM {table}")
+        assert result['count'].iloc[0] > 0
+
+
+def test_clear_data_transaction_error(db, sample_data):
+    """Test that a failure to begin the transaction surfaces as RuntimeError."""
+    db.store_data(sample_data)
+    db.conn.begin()
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.clear_data()
+    assert "Failed to clear data" in str(exc_info.value)
+
+
+def test_replace_data(db, sample_data):
+    """Test that replace_data swaps the stored data for the new data."""
+    db.store_data(sample_data)
+    sample_data["spot_advisor"] = {"us-west-2": {"Linux": {"m5.xlarge": {"s": 90, "r": 0}}}}
+
+    db.replace_data(sample_data)
+
+    assert db.query_one("SELECT COUNT(*) FROM cache_timestamp") == (1,)
+    assert db.query_one("SELECT region, spot_score FROM spot_candidates") == ("us-west-2", 90)
+
+
+def test_replace_data_failure_keeps_previous_data(db, sample_data):
+    """Test that a failed replace rolls back to the previous data."""
+    db.store_data(sample_data)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.replace_data({"global_rate": "0.2", "instance_types": {}})
+    assert "Failed to replace data" in str(exc_info.value)
+
+    assert db.query_one("SELECT global_rate FROM global_rate") == ("0.1",)
+    assert db.query_one("SELECT COUNT(*) FROM spot_candidates") == (3,)
+    assert db.query_one("SELECT COUNT(*) FROM cache_timestamp") == (1,)
+
+
+def test_store_data_failure_writes_nothing(db):
+    """Test that a failed store leaves no partial rows, including the timestamp."""
+    with pytest.raises(RuntimeError):
+        db.store_data({"global_rate": "0.1", "instance_types": {}})
+
+    for table in DuckDBStorage.DATA_TABLES:
+        assert db.query_one(f"SELECT COUNT(*) FROM {table}") == (0,)
+
+
+def test_clear_data_error_without_active_transaction(db):
+    """Test that a failed begin still raises RuntimeError when there is nothing to roll back."""
+    conn = db.conn
+    db.conn = Mock()
+    db.conn.begin.side_effect = duckdb.Error("cannot begin")
+    db.conn.rollback.side_effect = duckdb.TransactionException("no transaction is active")
+    try:
+        with pytest.raises(RuntimeError) as exc_info:
+            db.clear_data()
+        assert "Failed to clear data: cannot begin" in str(exc_info.value)
+    finally:
+        db.conn = conn
+
+
 def test_query_with_parameters(db, sample_data):
     """Test querying with parameters."""
     db.store_data(sample_data)
@@ -125,6 +286,23 @@ def test_query_with_parameters(db, sample_data):
     assert result['instance_type'].iloc[0] == "c6g.2xlarge"
 
 
+def test_query_one(db, sample_data):
+    """Test fetching a single row as a tuple."""
+    db.store_data(sample_data)
+
+    row = db.query_one(
+        "SELECT instance_type, cores FROM instance_types WHERE cores > ?",
+        params=[4]
+    )
+    assert row == ("c6g.2xlarge", 8)
+
+    assert db.query_one("SELECT * FROM instance_types WHERE cores > 100") is None
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.query_one("SELECT * FROM nonexistent_table")
+    assert "Query failed" in str(exc_info.value)
+
+
 def test_error_handling(db):
     """Test error handling in database operations."""
     # Test invalid query
@@ -161,3 +339,19 @@ def test_no_connection_operations():
     with pytest.raises(RuntimeError) as exc_info:
         db.clear_data()
     assert "No database connection" in str(exc_info.value)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.replace_data({})
+    assert "No database connection" in str(exc_info.value)
+
+
+def test_query_one_after_disconnect(sample_data):
+    """Test that query_one fails once the connection is closed."""
+    db = DuckDBStorage(":memory:")
+    db.connect()
+    db.store_data(sample_data)
+    db.disconnect()
+
+    with pytest.raises(RuntimeError) as exc_info:
+        db.query_one("SELECT COUNT(*) FROM instance_types")
+    assert "No database connection" in str(exc_info.value)
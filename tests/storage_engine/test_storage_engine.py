@@ -1,4 +1,6 @@
 import pytest
+import pandas as pd
+
 from spot_optimizer.storage_engine.storage_engine import StorageEngine
 
 
@@ -44,3 +46,54 @@ def test_storage_engine_is_abstract():
     
     # This should not raise any exceptions
     ValidStorage()
+
+
+def test_query_one_default_uses_query_data():
+    """Test that the default query_one returns the first row of query_data."""
+    class FrameStorage(StorageEngine):
+        def __init__(self, frame):
+            self.frame = frame
+
+        def connect(self):
+            pass
+
+        def disconnect(self):
+            pass
+
+        def store_data(self, data):
+            pass
+
+        def query_data(self, query, params=None):
+            return self.frame
+
+        def clear_data(self):
+            pass
+
+    storage = FrameStorage(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+    assert storage.query_one("SELECT a, b FROM t") == (1, "x")
+
+    assert FrameStorage(pd.DataFrame()).query_one("SELECT a FROM t") is None
+
+
+def test_replace_data_default_clears_then_stores():
+    """Test that the default replace_data clears before storing."""
+    calls = []
+
+    class RecordingStorage(StorageEngine):
+        def connect(self):
+            pass
+
+        def disconnect(self):
+            pass
+
+        def store_data(self, data):
+            calls.append(("store", data))
+
+        def query_data(self, query, params=None):
+            pass
+
+        def clear_data(self):
+            calls.append(("clear",))
+
+    RecordingStorage().replace_data({"a": 1})
+    assert calls == [("clear",), ("store", {"a": 1})]
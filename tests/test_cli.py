@@ -1,5 +1,7 @@
 import pytest
 import json
+import subprocess
+import sys
 from argparse import ArgumentTypeError, ArgumentParser
 from unittest.mock import patch
 
@@ -150,3 +152,14 @@ def test_main_invalid_inputs(args, expected_error):
         with pytest.raises(SystemExit) as exc_info:
             main()
         assert exc_info.value.code == 2
+
+def test_cli_import_is_lazy():
+    """Test that importing the CLI does not load the optimizer's heavy dependencies."""
+    code = (
+        "import sys, spot_optimizer.cli; "
+        "print(any(m in sys.modules for m in ('duckdb', 'pandas', 'requests')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
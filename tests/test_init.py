@@ -0,0 +1,42 @@
+import pytest
+from unittest.mock import patch
+
+import spot_optimizer
+from spot_optimizer.config import SpotOptimizerConfig
+from spot_optimizer.spot_optimizer import SpotOptimizer
+
+
+@pytest.fixture
+def package_namespace(monkeypatch):
+    """Drop lazily resolved names so each test goes through __getattr__ again."""
+    namespace = vars(spot_optimizer)
+    for name in ('SpotOptimizer', 'SpotOptimizerConfig'):
+        monkeypatch.delitem(namespace, name, raising=False)
+    return namespace
+
+
+def test_lazy_spot_optimizer(package_namespace):
+    """Test that SpotOptimizer is resolved on first access and then cached."""
+    assert 'SpotOptimizer' not in package_namespace
+    assert spot_optimizer.SpotOptimizer is SpotOptimizer
+    assert package_namespace['SpotOptimizer'] is SpotOptimizer
+
+
+def test_lazy_spot_optimizer_config(package_namespace):
+    """Test that SpotOptimizerConfig is resolved on first access and then cached."""
+    assert 'SpotOptimizerConfig' not in package_namespace
+    assert spot_optimizer.SpotOptimizerConfig is SpotOptimizerConfig
+    assert package_namespace['SpotOptimizerConfig'] is SpotOptimizerConfig
+
+
+def test_lazy_default_optimizer():
+    """Test that default_optimizer returns the shared optimizer."""
+    with patch.object(SpotOptimizer, 'get_instance') as mock_get_instance:
+        assert spot_optimizer.default_optimizer is mock_get_instance.return_value
+    mock_get_instance.assert_called_once_with()
+
+
+def test_unknown_attribute():
+    """Test that unknown names still raise AttributeError."""
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        spot_optimizer.missing
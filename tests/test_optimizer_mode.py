@@ -8,6 +8,15 @@ def test_optimizer_modes():
     assert Mode.BALANCED.value == "balanced"
     assert Mode.FAULT_TOLERANCE.value == "fault_tolerance"
     assert len(Mode) == 3
+
+
+def test_optimizer_modes_match_plain_strings():
+    """Test that modes can be used interchangeably with their string values."""
+    assert Mode.LATENCY == "latency"
+    assert Mode("balanced") is Mode.BALANCED
+
+    ranges = Mode.calculate_ranges(8, 32)
+    assert ranges[Mode.FAULT_TOLERANCE] == ranges["fault_tolerance"]
     
     
 @pytest.mark.parametrize("cores, memory, expected_ranges", [
@@ -90,3 +99,20 @@ def test_large_workload_distinct_ranges():
     assert balanced_min > latency_max, "Balanced range should start after latency range ends"
     assert fault_min > balanced_max, "Fault tolerance range should start after balanced range ends"
 
+
+def test_mode_ranges_are_cached_and_read_only():
+    """Test that repeated range calculations reuse one read-only result."""
+    first = Mode.calculate_ranges(128, 512)
+    assert Mode.calculate_ranges(128, 512) is first
+    
+    with pytest.raises(TypeError):
+        first['latency'] = (1, 1)
+
+
+@pytest.mark.parametrize("cores,memory", [(8, 32), (256, 1024)])
+def test_calculate_range_matches_ranges(cores, memory):
+    """Test that the single-mode range matches the full range mapping."""
+    ranges = Mode.calculate_ranges(cores, memory)
+    for mode in Mode:
+        assert Mode.calculate_range(mode, cores, memory) == ranges[mode.value]
+        assert Mode.calculate_range(mode.value, cores, memory) == ranges[mode.value]
@@ -14,22 +14,24 @@ class TestOptimizationQueryBuilder:
         
         assert "WITH ranked_instances AS" in query
         assert "SELECT" in query
-        assert "FROM instance_types i" in query
-        assert "JOIN spot_advisor s" in query
+        assert "FROM spot_candidates c" in query
+        assert "JOIN" not in query
         assert "ORDER BY" in query
         assert "LIMIT 1" in query
+        assert "total_cores >=" not in query
+        assert "total_memory >=" not in query
 
     def test_build_optimization_query_with_ssd_filter(self):
         """Test query building with SSD filter."""
         query = OptimizationQueryBuilder.build_optimization_query(ssd_only=True)
         
-        assert "AND i.storage_type = 'instance'" in query
+        assert "AND c.storage_type = 'instance'" in query
 
     def test_build_optimization_query_without_arm(self):
         """Test query building without ARM instances."""
         query = OptimizationQueryBuilder.build_optimization_query(arm_instances=False)
         
-        assert "AND i.architecture != 'arm64'" in query
+        assert "AND c.architecture != 'arm64'" in query
 
     def test_build_optimization_query_with_instance_family(self):
         """Test query building with instance family filter."""
@@ -37,7 +39,7 @@ class TestOptimizationQueryBuilder:
             instance_family=["m5", "c5"]
         )
         
-        assert "AND i.instance_family IN (?,?)" in query
+        assert "AND c.instance_family IN (?,?)" in query
 
     def test_build_optimization_query_all_filters(self):
         """Test query building with all filters enabled."""
@@ -47,9 +49,19 @@ class TestOptimizationQueryBuilder:
             instance_family=["m6i", "r6i", "c6i"]
         )
         
-        assert "AND i.storage_type = 'instance'" in query
-        assert "AND i.architecture != 'arm64'" in query
-        assert "AND i.instance_family IN (?,?,?)" in query
+        assert "AND c.storage_type = 'instance'" in query
+        assert "AND c.architecture != 'arm64'" in query
+        assert "AND c.instance_family IN (?,?,?)" in query
+
+    def test_build_optimization_query_is_reused(self):
+        """Test that identical filter combinations share one formatted query."""
+        first = OptimizationQueryBuilder.build_optimization_query(instance_family=["m5", "c5"])
+        second = OptimizationQueryBuilder.build_optimization_query(instance_family=["r6g", "x2g"])
+        other = OptimizationQueryBuilder.build_optimization_query(instance_family=["m5"])
+        
+        assert first is second
+        assert "IN (?,?)" in first
+        assert "IN (?)" in other
 
     def test_build_query_parameters_basic(self):
         """Test basic parameter building."""
@@ -66,7 +78,6 @@ class TestOptimizationQueryBuilder:
             8, 32, "us-west-2",  # Basic params
             8, 8,                # CPU waste calculation
             32, 32,              # Memory waste calculation
-            8, 32,               # Minimum resource requirements
             1, 10                # Instance bounds
         ]
         
@@ -88,7 +99,6 @@ class TestOptimizationQueryBuilder:
             "m5", "c5",          # Instance family params
             4, 4,                # CPU waste calculation
             16, 16,              # Memory waste calculation
-            4, 16,               # Minimum resource requirements
             2, 8                 # Instance bounds
         ]
         
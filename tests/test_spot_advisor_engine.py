@@ -1,14 +1,15 @@
 import pytest
-import pandas as pd
 
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
+from spot_optimizer.storage_engine.duckdb_storage_engine import DuckDBStorage
 from spot_optimizer.spot_advisor_engine import (
     should_refresh_data,
     refresh_spot_data,
     ensure_fresh_data,
-    CACHE_EXPIRY_SECONDS
+    CACHE_EXPIRY_SECONDS,
+    STALE_DATA_MAX_AGE_SECONDS
 )
 
 
@@ -43,18 +44,23 @@ def sample_spot_data():
 
 def test_should_refresh_data_empty_db(mock_db):
     """Test should_refresh_data when database is empty."""
-    mock_db.query_data.return_value = pd.DataFrame()
+    mock_db.query_one.return_value = None
+    
+    assert should_refresh_data(mock_db) is True
+    mock_db.query_one.assert_called_once()
+
+
+def test_should_refresh_data_null_timestamp(mock_db):
+    """Test should_refresh_data when the timestamp table is empty."""
+    mock_db.query_one.return_value = (None,)
     
     assert should_refresh_data(mock_db) is True
-    mock_db.query_data.assert_called_once()
 
 
 def test_should_refresh_data_expired(mock_db):
     """Test should_refresh_data when cache is expired."""
     old_timestamp = datetime.now() - timedelta(seconds=CACHE_EXPIRY_SECONDS + 100)
-    mock_db.query_data.return_value = pd.DataFrame({
-        'timestamp': [old_timestamp]
-    })
+    mock_db.query_one.return_value = (old_timestamp,)
     
     assert should_refresh_data(mock_db) is True
 
@@ -62,16 +68,14 @@ def test_should_refresh_data_expired(mock_db):
 def test_should_refresh_data_fresh(mock_db):
     """Test should_refresh_data when cache is fresh."""
     fresh_timestamp = datetime.now() - timedelta(seconds=CACHE_EXPIRY_SECONDS - 100)
-    mock_db.query_data.return_value = pd.DataFrame({
-        'timestamp': [fresh_timestamp]
-    })
+    mock_db.query_one.return_value = (fresh_timestamp,)
     
     assert should_refresh_data(mock_db) is False
 
 
 def test_should_refresh_data_db_error(mock_db):
     """Test should_refresh_data handles database errors."""
-    mock_db.query_data.side_effect = Exception("Database error")
+    mock_db.query_one.side_effect = Exception("Database error")
     
     assert should_refresh_data(mock_db) is True
 
@@ -83,8 +87,7 @@ def test_refresh_spot_data(mock_advisor, mock_db, sample_spot_data):
     refresh_spot_data(mock_advisor, mock_db)
     
     mock_advisor.fetch_data.assert_called_once()
-    mock_db.clear_data.assert_called_once()
-    mock_db.store_data.assert_called_once_with(sample_spot_data)
+    mock_db.replace_data.assert_called_once_with(sample_spot_data)
 
 
 def test_refresh_spot_data_error(mock_advisor, mock_db):
@@ -97,33 +100,29 @@ def test_refresh_spot_data_error(mock_advisor, mock_db):
 
 def test_ensure_fresh_data_when_needed(mock_advisor, mock_db, sample_spot_data):
     """Test ensure_fresh_data when refresh is needed."""
-    mock_db.query_data.return_value = pd.DataFrame()  # Empty DB
+    mock_db.query_one.return_value = None  # Empty DB
     mock_advisor.fetch_data.return_value = sample_spot_data
     
     ensure_fresh_data(mock_advisor, mock_db)
     
     mock_advisor.fetch_data.assert_called_once()
-    mock_db.clear_data.assert_called_once()
-    mock_db.store_data.assert_called_once_with(sample_spot_data)
+    mock_db.replace_data.assert_called_once_with(sample_spot_data)
 
 
 def test_ensure_fresh_data_when_not_needed(mock_advisor, mock_db):
     """Test ensure_fresh_data when refresh is not needed."""
     fresh_timestamp = datetime.now() - timedelta(seconds=CACHE_EXPIRY_SECONDS - 100)
-    mock_db.query_data.return_value = pd.DataFrame({
-        'timestamp': [fresh_timestamp]
-    })
+    mock_db.query_one.return_value = (fresh_timestamp,)
     
     ensure_fresh_data(mock_advisor, mock_db)
     
     mock_advisor.fetch_data.assert_not_called()
-    mock_db.clear_data.assert_not_called()
-    mock_db.store_data.assert_not_called()
+    mock_db.replace_data.assert_not_called()
 
 
 def test_ensure_fresh_data_error_handling(mock_advisor, mock_db):
     """Test ensure_fresh_data error handling."""
-    mock_db.query_data.side_effect = Exception("Database error")
+    mock_db.query_one.side_effect = Exception("Database error")
     mock_advisor.fetch_data.side_effect = Exception("Fetch error")
     
     with pytest.raises(Exception, match="Fetch error"):
@@ -132,10 +131,58 @@ def test_ensure_fresh_data_error_handling(mock_advisor, mock_db):
 
 def test_ensure_fresh_data_error_handling(mock_advisor, mock_db):
     """Test ensure_fresh_data error handling."""
-    mock_db.query_data.side_effect = Exception("Database error")
+    mock_db.query_one.side_effect = Exception("Database error")
     mock_advisor.fetch_data.side_effect = Exception("Fetch error")
     
     # DB error is treated as cache miss, so it will try to fetch,
     # which will then fail with Fetch error
     with pytest.raises(Exception, match="Fetch error"):
         ensure_fresh_data(mock_advisor, mock_db)
+
+
+def test_ensure_fresh_data_serves_stale_on_fetch_error(mock_advisor, mock_db):
+    """Test ensure_fresh_data keeps stale data when the refresh fails."""
+    stale_timestamp = datetime.now() - timedelta(seconds=CACHE_EXPIRY_SECONDS + 100)
+    mock_db.query_one.return_value = (stale_timestamp,)
+    mock_advisor.fetch_data.side_effect = Exception("Fetch error")
+    
+    ensure_fresh_data(mock_advisor, mock_db)
+    
+    mock_advisor.fetch_data.assert_called_once()
+    mock_db.replace_data.assert_not_called()
+
+
+def test_ensure_fresh_data_raises_when_data_too_old(mock_advisor, mock_db):
+    """Test ensure_fresh_data raises when the stored data is too old to serve."""
+    old_timestamp = datetime.now() - timedelta(seconds=STALE_DATA_MAX_AGE_SECONDS + 100)
+    mock_db.query_one.return_value = (old_timestamp,)
+    mock_advisor.fetch_data.side_effect = Exception("Fetch error")
+    
+    with pytest.raises(Exception, match="Fetch error"):
+        ensure_fresh_data(mock_advisor, mock_db)
+
+
+def test_ensure_fresh_data_keeps_old_data_on_bad_payload(mock_advisor):
+    """Test that a refresh failing part-way through keeps the previous data and timestamp."""
+    good_data = {
+        "global_rate": "0.1",
+        "instance_types": {"m5.xlarge": {"cores": 4, "ram_gb": 16.0}},
+        "ranges": [{"index": 1, "label": "low", "dots": 1, "max": 5}],
+        "spot_advisor": {"us-west-2": {"Linux": {"m5.xlarge": {"s": 75, "r": 1}}}}
+    }
+    # "ranges" is missing, so storing fails after the earlier tables are written
+    bad_data = {key: value for key, value in good_data.items() if key != "ranges"}
+    stale_timestamp = datetime.now() - timedelta(seconds=CACHE_EXPIRY_SECONDS + 100)
+    
+    with DuckDBStorage(":memory:") as db:
+        db.store_data(good_data)
+        db.conn.execute("UPDATE cache_timestamp SET timestamp = ?", [stale_timestamp])
+        mock_advisor.fetch_data.return_value = bad_data
+        
+        ensure_fresh_data(mock_advisor, db)
+        
+        assert db.query_one("SELECT COUNT(*) FROM spot_candidates") == (1,)
+        assert db.query_one("SELECT COUNT(*) FROM ranges") == (1,)
+        assert db.query_one("SELECT MAX(timestamp) FROM cache_timestamp") == (stale_timestamp,)
+        # The timestamp is still stale, so the next call retries the refresh
+        assert should_refresh_data(db) is True
@@ -1,10 +1,11 @@
 import os
 import pytest
 from unittest.mock import Mock, patch
-import pandas as pd
 from spot_optimizer.spot_optimizer import SpotOptimizer
 from spot_optimizer.config import SpotOptimizerConfig
 from spot_optimizer.optimizer_mode import Mode
+from spot_optimizer.query_builder import OptimizationQueryBuilder
+from spot_optimizer.spot_advisor_engine import FRESHNESS_CHECK_INTERVAL_SECONDS
 
 @pytest.fixture
 def mock_config(tmp_path):
@@ -54,6 +55,18 @@ def test_singleton_pattern():
     # Clean up singleton for other tests
     SpotOptimizer._instance = None
 
+def test_module_optimize_uses_singleton():
+    """Test that the package-level optimize() shares the singleton optimizer."""
+    import spot_optimizer
+    
+    with patch.object(SpotOptimizer, 'get_instance') as mock_get_instance:
+        mock_get_instance.return_value.optimize.return_value = {'mode': 'balanced'}
+        result = spot_optimizer.optimize(cores=8, memory=32)
+    
+    assert result == {'mode': 'balanced'}
+    mock_get_instance.assert_called_once_with()
+    mock_get_instance.return_value.optimize.assert_called_once()
+
 def test_initialization(optimizer, mock_db, mock_config):
     """Test optimizer initialization."""
     assert optimizer.db is mock_db
@@ -69,25 +82,17 @@ def test_cleanup(mock_db, mock_advisor, mock_config):
         optimizer = SpotOptimizer(mock_config)
         optimizer.__del__()
         mock_db.disconnect.assert_called_once()
+        mock_advisor.close.assert_called_once()
 
 @pytest.fixture
 def sample_query_result():
-    return pd.DataFrame({
-        'instance_type': ['m5.xlarge'],
-        'cores': [4],
-        'ram_gb': [16],
-        'spot_score': [75],
-        'interruption_rate': [1],
-        'instances_needed': [2],
-        'total_cores': [8],
-        'total_memory': [32],
-        'cpu_waste_pct': [0],
-        'memory_waste_pct': [0]
-    })
+    # instance_type, instances_needed, total_cores, total_memory,
+    # spot_score, interruption_rate, cpu_waste_pct, memory_waste_pct
+    return ('m5.xlarge', 2.0, 8.0, 32.0, 75, 1, 0.0, 0.0)
 
 def test_optimize_success(optimizer, mock_db, sample_query_result):
     """Test successful optimization with valid parameters."""
-    mock_db.query_data.return_value = sample_query_result
+    mock_db.query_one.return_value = sample_query_result
     
     # Mock the query builder methods
     optimizer.query_builder.build_optimization_query.return_value = "SELECT * FROM instances"
@@ -117,7 +122,7 @@ def test_optimize_success(optimizer, mock_db, sample_query_result):
 
 def test_optimize_no_results(optimizer, mock_db):
     """Test optimization when no suitable instances are found."""
-    mock_db.query_data.return_value = pd.DataFrame()
+    mock_db.query_one.return_value = None
     
     # Mock the error message builder to return expected string
     optimizer.query_builder.build_error_message_params.return_value = "No suitable instances found matching for cpu = 8 and memory = 32 and region = us-west-2 and mode = balanced"
@@ -125,9 +130,24 @@ def test_optimize_no_results(optimizer, mock_db):
     with pytest.raises(ValueError, match="No suitable instances found matching for cpu = 8 and memory = 32 and region = us-west-2 and mode = balanced"):
         optimizer.optimize(cores=8, memory=32)
 
+def test_optimize_accepts_mode_member(optimizer, mock_db, sample_query_result):
+    """Test that a Mode member is handled as its plain string value."""
+    optimizer.query_builder = OptimizationQueryBuilder()
+    mock_db.query_one.return_value = sample_query_result
+    
+    with patch('spot_optimizer.spot_optimizer.ensure_fresh_data'):
+        result = optimizer.optimize(cores=8, memory=32, mode=Mode.BALANCED)
+        assert result["mode"] == "balanced"
+        assert type(result["mode"]) is str
+        
+        mock_db.query_one.return_value = None
+        with pytest.raises(ValueError) as exc_info:
+            optimizer.optimize(cores=16, memory=64, mode=Mode.FAULT_TOLERANCE)
+    assert str(exc_info.value).endswith("mode = fault_tolerance")
+
 def test_optimize_with_instance_family(optimizer, mock_db, sample_query_result):
     """Test optimization with instance family filter."""
-    mock_db.query_data.return_value = sample_query_result
+    mock_db.query_one.return_value = sample_query_result
     
     # Mock the query builder to return a query string with instance family filter
     optimizer.query_builder.build_optimization_query.return_value = "SELECT * FROM instances WHERE instance_family IN (?, ?)"
@@ -149,7 +169,7 @@ def test_optimize_with_instance_family(optimizer, mock_db, sample_query_result):
 
 def test_optimize_with_ssd_only(optimizer, mock_db, sample_query_result):
     """Test optimization with SSD-only filter."""
-    mock_db.query_data.return_value = sample_query_result
+    mock_db.query_one.return_value = sample_query_result
     
     # Mock the query builder to return a query string with SSD filter
     optimizer.query_builder.build_optimization_query.return_value = "SELECT * FROM instances WHERE storage_type = 'instance'"
@@ -169,7 +189,7 @@ def test_optimize_with_ssd_only(optimizer, mock_db, sample_query_result):
 
 def test_optimize_with_arm_instances(optimizer, mock_db, sample_query_result):
     """Test optimization with ARM instances disabled."""
-    mock_db.query_data.return_value = sample_query_result
+    mock_db.query_one.return_value = sample_query_result
     
     # Mock the query builder to return a query string that excludes ARM
     optimizer.query_builder.build_optimization_query.return_value = "SELECT * FROM instances WHERE architecture != 'arm64'"
@@ -194,7 +214,7 @@ def test_optimize_with_arm_instances(optimizer, mock_db, sample_query_result):
 ])
 def test_optimize_different_modes(optimizer, mock_db, sample_query_result, mode):
     """Test optimization with different modes."""
-    mock_db.query_data.return_value = sample_query_result
+    mock_db.query_one.return_value = sample_query_result
     
     result = optimizer.optimize(
         cores=8,
@@ -206,11 +226,73 @@ def test_optimize_different_modes(optimizer, mock_db, sample_query_result, mode)
 
 def test_optimize_database_error(optimizer, mock_db):
     """Test handling of database errors."""
-    mock_db.query_data.side_effect = Exception("Database error")
+    mock_db.query_one.side_effect = Exception("Database error")
     
     with pytest.raises(Exception, match="Database error"):
         optimizer.optimize(cores=8, memory=32)
 
+def test_optimize_checks_freshness_once_per_interval(optimizer, mock_db, sample_query_result):
+    """Test that back-to-back optimizations skip the repeated freshness check."""
+    mock_db.query_one.return_value = sample_query_result
+    
+    with patch('spot_optimizer.spot_optimizer.ensure_fresh_data') as mock_ensure, \
+         patch('spot_optimizer.spot_optimizer.monotonic') as mock_monotonic:
+        mock_monotonic.return_value = 1000.0
+        optimizer.optimize(cores=8, memory=32)
+        optimizer.optimize(cores=8, memory=32)
+        assert mock_ensure.call_count == 1
+        
+        mock_monotonic.return_value = 1000.0 + FRESHNESS_CHECK_INTERVAL_SECONDS
+        optimizer.optimize(cores=8, memory=32)
+        assert mock_ensure.call_count == 2
+
+def test_optimize_caches_results(optimizer, mock_db, sample_query_result):
+    """Test that repeated identical requests are served from the result cache."""
+    mock_db.query_one.return_value = sample_query_result
+    
+    with patch('spot_optimizer.spot_optimizer.ensure_fresh_data'):
+        first = optimizer.optimize(cores=8, memory=32, instance_family=["m5"])
+        first["instances"]["type"] = "mutated"
+        second = optimizer.optimize(cores=8, memory=32, instance_family=["m5"])
+        
+        assert second["instances"]["type"] == "m5.xlarge"
+        assert mock_db.query_one.call_count == 1
+        
+        optimizer.optimize(cores=8, memory=32, instance_family=["c5"])
+        assert mock_db.query_one.call_count == 2
+
+def test_optimize_result_cache_cleared_on_freshness_check(optimizer, mock_db, sample_query_result):
+    """Test that cached results are dropped when the data freshness is re-checked."""
+    mock_db.query_one.return_value = sample_query_result
+    
+    with patch('spot_optimizer.spot_optimizer.ensure_fresh_data'), \
+         patch('spot_optimizer.spot_optimizer.monotonic') as mock_monotonic:
+        mock_monotonic.return_value = 1000.0
+        optimizer.optimize(cores=8, memory=32)
+        optimizer.optimize(cores=8, memory=32)
+        assert mock_db.query_one.call_count == 1
+        
+        mock_monotonic.return_value = 1000.0 + FRESHNESS_CHECK_INTERVAL_SECONDS
+        optimizer.optimize(cores=8, memory=32)
+        assert mock_db.query_one.call_count == 2
+
+def test_optimize_result_cache_evicts_least_recent(optimizer, mock_db, sample_query_result):
+    """Test that the result cache is bounded."""
+    mock_db.query_one.return_value = sample_query_result
+    
+    with patch('spot_optimizer.spot_optimizer.ensure_fresh_data'), \
+         patch('spot_optimizer.spot_optimizer.RESULT_CACHE_SIZE', 2):
+        optimizer.optimize(cores=8, memory=32)
+        optimizer.optimize(cores=16, memory=64)
+        optimizer.optimize(cores=8, memory=32)
+        optimizer.optimize(cores=32, memory=128)
+        assert mock_db.query_one.call_count == 3
+        
+        optimizer.optimize(cores=8, memory=32)
+        assert mock_db.query_one.call_count == 3
+        optimizer.optimize(cores=16, memory=64)
+        assert mock_db.query_one.call_count == 4
+
 def test_optimize_invalid_parameters(optimizer):
     """Test optimization with invalid parameters."""
     with pytest.raises(ValueError):